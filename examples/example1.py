@@ -17,7 +17,6 @@ clock = pygame.time.Clock()
 
 # Main game loop
 running = True
-total_time = 0
 while running:
     # Tick the clock at 60 frames per second
     clock.tick(60)
@@ -27,19 +26,22 @@ while running:
     engine.clear(255, 0, 255)
 
     # Update the time and angle
-    total_time += clock.get_time()
+    total_time = pygame.time.get_ticks()
     angle = total_time * 0.05
 
     # Render texture to screen
     engine.render(tex, engine.screen,
                   position=(200, 200), scale=16., angle=angle)
 
+    # Measure the time before flipping, so that waiting for the buffer
+    # swap (and vsync) is not counted as render time
+    t = time()
+    mspt = (t-t0)*1000
+
     # Update the display
     pygame.display.flip()
 
     # Display mspt
-    t = time()
-    mspt = (t-t0)*1000
     pygame.display.set_caption(f'{mspt:.3f} ms per tick')
 
     # Process events
@@ -1,5 +1,5 @@
-from random import randint
 from time import time
+import numpy as np
 import pygame
 from pygame_render import RenderEngine
 
@@ -19,15 +19,14 @@ clock = pygame.time.Clock()
 
 # Positions
 num_sprites = 1000
-positions = [(randint(0, width), randint(0, height))
-             for _ in range(num_sprites)]
+positions = np.random.randint(0, (width + 1, height + 1),
+                              size=(num_sprites, 2)).astype(np.float32)
 
 # Load shader
 shader_glow = engine.load_shader_from_path('vertex.glsl', 'fragment_glow.glsl')
 
 # Main game loop
 running = True
-total_time = 0
 while running:
     # Tick the clock at 60 frames per second
     clock.tick(60)
@@ -37,23 +36,25 @@ while running:
     engine.clear(64, 128, 64)
 
     # Update the time
-    total_time += clock.get_time()
+    total_time = pygame.time.get_ticks()
 
     # Send time uniform to glow shader
     shader_glow['time'] = total_time
 
-    # Render texture to screen
+    # Render all the sprites to screen in a single draw call
     angle = total_time * 0.05
-    for p in positions:
-        engine.render(tex, engine.screen,
-                      position=p, scale=16., angle=angle, shader=shader_glow)
+    engine.render_batch_arrays(tex, engine.screen, positions, scales=16.,
+                               angles=angle, shader=shader_glow)
+
+    # Measure the time before flipping, so that waiting for the buffer
+    # swap (and vsync) is not counted as render time
+    t = time()
+    mspt = (t-t0)*1000
 
     # Update the display
     pygame.display.flip()
 
     # Display mspt
-    t = time()
-    mspt = (t-t0)*1000
     pygame.display.set_caption(
         f'Rendering {num_sprites} sprites at {mspt:.3f} ms per tick!')
 
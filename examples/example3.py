@@ -41,12 +41,15 @@ while running:
     while anim_ind >= anim_frames:
         anim_ind -= anim_frames
 
+    # Measure the time before flipping, so that waiting for the buffer
+    # swap (and vsync) is not counted as render time
+    t = time()
+    mspt = (t-t0)*1000
+
     # Update the display
     pygame.display.flip()
 
     # Display mspt
-    t = time()
-    mspt = (t-t0)*1000
     pygame.display.set_caption(f'{mspt:.3f} ms per tick')
 
     # Process events
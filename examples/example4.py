@@ -50,19 +50,22 @@ while running:
     values[6] = 1 if keys[pygame.K_b] else 0
     values[7] = 1 if keys[pygame.K_a] else 0
 
-    # Send uniform block data
-    ubo_shader['valuesUBO'] = values.tobytes()
+    # Send uniform block data, the array is written without copying it into bytes
+    ubo_shader['valuesUBO'] = values
 
     # Render texture to screen
     engine.render(tex, engine.screen,
                   position=(200, 200), scale=16., shader=ubo_shader)
 
+    # Measure the time before flipping, so that waiting for the buffer
+    # swap (and vsync) is not counted as render time
+    t = time()
+    mspt = (t-t0)*1000
+
     # Update the display
     pygame.display.flip()
 
     # Display mspt
-    t = time()
-    mspt = (t-t0)*1000
     pygame.display.set_caption(f'{mspt:.3f} ms per tick')
 
     # Process events
@@ -21,7 +21,6 @@ clock = pygame.time.Clock()
 
 # Main game loop
 running = True
-total_time = 0
 while running:
     # Tick the clock at 60 frames per second
     clock.tick(60)
@@ -31,7 +30,7 @@ while running:
     layer.clear(0, 0, 0)
 
     # Update the time and angle
-    total_time += clock.get_time()
+    total_time = pygame.time.get_ticks()
     angle = total_time * 0.1
 
     # Render texture to the layer
@@ -40,12 +39,15 @@ while running:
     # Upscale the texture to fit the screen
     engine.render(layer.texture, engine.screen, scale=scale)
 
+    # Measure the time before flipping, so that waiting for the buffer
+    # swap (and vsync) is not counted as render time
+    t = time()
+    mspt = (t-t0)*1000
+
     # Update the display
     pygame.display.flip()
 
     # Display mspt
-    t = time()
-    mspt = (t-t0)*1000
     pygame.display.set_caption(f'{mspt:.3f} ms per tick')
 
     # Process events
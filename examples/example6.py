@@ -18,6 +18,10 @@ shader_mask = engine.load_shader_from_path('vertex.glsl', 'fragment_mask.glsl')
 # Font
 font = pygame.font.SysFont(pygame.font.get_default_font(), 64)
 
+# Texture with the uptime text, only updated when the text changes
+font_text = None
+font_texture = None
+
 # Clock
 clock = pygame.time.Clock()
 
@@ -33,9 +37,18 @@ while running:
 
     # Render texture with uptime
     t = time() - start_time
-    font_sfc = font.render(f'{t:.2f}', True,
-                           (255, 255, 255), (0, 0, 0))
-    font_texture = engine.surface_to_texture(font_sfc)
+    text = f'{t:.2f}'
+    if text != font_text:
+        font_sfc = font.render(text, True, (255, 255, 255), (0, 0, 0))
+        if font_texture is not None and font_texture.size == font_sfc.get_size():
+            # Same size as before, overwrite the pixels of the texture
+            engine.update_texture(font_texture, font_sfc)
+        else:
+            # Release the texture of the previous text
+            if font_texture is not None:
+                font_texture.release()
+            font_texture = engine.surface_to_texture(font_sfc)
+        font_text = text
 
     # Send font_texture to the shader
     shader_mask['fontTexture'] = font_texture
@@ -46,9 +59,6 @@ while running:
     # Render both textures to screen using the mask shader
     engine.render(tex_clouds, engine.screen, shader=shader_mask)
 
-    # Release texture's allocated memory
-    font_texture.release()
-
     # Update the display
     pygame.display.flip()
 
@@ -41,12 +41,15 @@ while running:
     engine.render_lines(engine.screen, (255, 255, 0),
                         vertices=[(350, 300), (400, 400), (500, 250), (550, 350), (575, 275)], strip=True)
 
+    # Measure the time before flipping, so that waiting for the buffer
+    # swap (and vsync) is not counted as render time
+    t = time()
+    mspt = (t-t0)*1000
+
     # Update the display
     pygame.display.flip()
 
     # Display mspt
-    t = time()
-    mspt = (t-t0)*1000
     pygame.display.set_caption(f'{mspt:.3f} ms per tick')
 
     # Process events
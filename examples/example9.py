@@ -1,5 +1,5 @@
 import pygame
-from pygame_render import RenderEngine
+from pygame_render import RenderEngine, NEAREST
 import math
 
 pygame.init()
@@ -8,13 +8,17 @@ display_size = (800, 600)
 engine = RenderEngine(display_size[0], display_size[1])
 screen = engine.make_layer(display_size)
 
-hdr_texture = engine.make_layer(display_size, dtype = 'f4')
-hdr_layer = engine.make_layer(display_size, dtype = 'f4')
+hdr_texture = engine.make_layer(display_size, dtype='f2')
+hdr_layer = engine.make_layer(display_size, dtype='f2')
 engine.HDR_exposure = 0.1
 
 pygame.font.init()
 font = pygame.font.SysFont("Arial", 30)
 
+# Persistent texture that the text is written into every frame
+text_texture = engine.ctx.texture(display_size, 4)
+text_texture.filter = (NEAREST, NEAREST)
+
 running = True
 time = 0
 while running:
@@ -33,10 +37,12 @@ while running:
 
     value_text = f"R value: {255 * value:.2f}"  # Format the value to 2 decimal places
     text_surface = font.render(value_text, True, (255, 255, 255))  # White text
-    texture = engine.surface_to_texture(text_surface)
-    
-    engine.render(texture, screen)
-    texture.release()
+
+    # Overwrite the corner of the text texture instead of allocating a new one
+    engine.update_texture(text_texture, text_surface)
+
+    w, h = text_surface.get_size()
+    engine.render(text_texture, screen, section=pygame.Rect(0, 0, w, h))
 
     engine.render(screen.texture, engine.screen)
 
@@ -30,12 +30,13 @@ except Exception as e:
 from .engine import RenderEngine
 from .layer import Layer
 from .shader import Shader
+from .batch import Batch
 from moderngl import Program, Buffer, Framebuffer, Texture
 
 NEAREST = moderngl.NEAREST
 LINEAR = moderngl.LINEAR
 
-__all__ = ['RenderEngine', 'Layer', 'Shader', 'Program', 'Buffer',
+__all__ = ['RenderEngine', 'Layer', 'Shader', 'Batch', 'Program', 'Buffer',
            'Framebuffer', 'Texture', 'NEAREST', 'LINEAR']
 
 # Version of the pygame_render package
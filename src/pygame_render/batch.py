@@ -0,0 +1,52 @@
+from moderngl import Buffer, Texture, VertexArray
+from pygame_render.shader import Shader
+
+
+class Batch:
+    """
+    A batch of copies of a texture whose transforms are uploaded to the GPU once.
+
+    Note: A Batch object cannot be instantiated directly. 
+    Use RenderEngine.make_batch to create one.
+    """
+
+    def __init__(self, tex: Texture, shader: Shader, vbo: Buffer, vao: VertexArray, count: int) -> None:
+        """
+        Initialize a Batch with its texture, shader, instance buffer, and vertex array.
+
+        Note: A Batch object cannot be instantiated directly. 
+        Use RenderEngine.make_batch to create one.
+        """
+
+        self._tex = tex
+        self._shader = shader
+        self._vbo = vbo
+        self._vao = vao
+        self._count = count
+
+    @property
+    def texture(self) -> Texture:
+        """Get the texture rendered by the batch."""
+        return self._tex
+
+    @property
+    def shader(self) -> Shader:
+        """Get the shader used to render the batch."""
+        return self._shader
+
+    @property
+    def vertex_array(self) -> VertexArray:
+        """Get the vertex array of the batch."""
+        return self._vao
+
+    @property
+    def count(self) -> int:
+        """Get the number of copies of the texture in the batch."""
+        return self._count
+
+    def release(self):
+        """
+        Release the ModernGL objects associated with the batch.
+        """
+        self._vao.release()
+        self._vbo.release()
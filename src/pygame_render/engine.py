@@ -1,17 +1,61 @@
+from functools import lru_cache
 from importlib import resources
+from itertools import groupby
+import os
 import warnings
 import numbers
-from math import sin, cos
+from math import radians, hypot, log2, e
 
 import moderngl
-from moderngl import Texture, Context, NEAREST
+from moderngl import Texture, Context, NEAREST, VertexArray
 import numpy as np
-from OpenGL.GL import glGetUniformBlockIndex, glUniformBlockBinding
 import pygame
 
+from pygame_render.batch import Batch
 from pygame_render.layer import Layer
 from pygame_render.shader import Shader
-from pygame_render.util import normalize_color_arguments, create_rotated_rect, to_dest_coords, to_source_coords
+from pygame_render.util import create_rotated_rect, create_rotated_rects, to_dest_coords_array, to_source_coords_array, QUAD_DEST_INDICES, QUAD_SECTION_INDICES, QUAD_VERTEX_DEST_INDICES, QUAD_VERTEX_SECTION_INDICES, QUAD_TRIANGLE_INDICES
+
+
+# Factor that turns exp(x) into exp2(x * _LOG2_E)
+_LOG2_E = log2(e)
+
+# Cosines and sines of a half circle split into 16 segments, for the caps of thick lines
+_HALF_CIRCLE_ANGLES = np.linspace(0, np.pi, 17)
+_HALF_CIRCLE_COS = np.cos(_HALF_CIRCLE_ANGLES)[:, None]
+_HALF_CIRCLE_SIN = np.sin(_HALF_CIRCLE_ANGLES)[:, None]
+
+# Points of a unit circle split into 32 segments, the default of render_circle
+_UNIT_CIRCLE_ANGLES = np.linspace(0, 2 * np.pi, 33)
+_UNIT_CIRCLE = np.stack([np.cos(_UNIT_CIRCLE_ANGLES),
+                         np.sin(_UNIT_CIRCLE_ANGLES)], axis=1)
+
+
+@lru_cache(maxsize=None)
+def _read_builtin_source(name: str) -> str:
+    """
+    Read the source of a shader shipped with the package, once per process.
+    """
+    return resources.read_text('pygame_render', name)
+
+
+# Source of the shader files read by load_shader_from_path, with their modification time
+_file_sources: dict[str, tuple[int, str]] = {}
+
+
+def _read_source_file(path: str) -> str:
+    """
+    Read the source of a shader file, reusing the previous read if the file has not changed.
+    """
+    mtime = os.stat(path).st_mtime_ns
+    cached = _file_sources.get(path)
+    if cached is not None and cached[0] == mtime:
+        return cached[1]
+
+    with open(path) as f:
+        src = f.read()
+    _file_sources[path] = (mtime, src)
+    return src
 
 
 class RenderEngine:
@@ -26,7 +70,8 @@ class RenderEngine:
     def __init__(self, screen_width: int, screen_height: int,
                  fullscreen: int | bool = 0, resizable: int | bool = 0,
                  noframe: int | bool = 0, scaled: int | bool = 0,
-                 depth: int = 0, display: int = 0, vsync: int = 0) -> None:
+                 depth: int = 0, display: int = 0, vsync: int = 0,
+                 msaa_samples: int = 0) -> None:
         """
         Initialize a rendering engine using Pygame and ModernGL.
 
@@ -40,6 +85,7 @@ class RenderEngine:
         - depth (int, optional): Depth of the rendering window. Default is 0.
         - display (int, optional): The display index to use. Default is 0.
         - vsync (int, optional): Set to 1 to enable vertical synchronization, 0 to disable. Default is 0.
+        - msaa_samples (int, optional): Number of samples per pixel of the screen for multisample antialiasing (e.g. 4), 0 to disable. Default is 0.
 
         Raises:
         - AssertionError: If Pygame is not initialized. Call pygame.init() before using the rendering engine.
@@ -56,8 +102,12 @@ class RenderEngine:
         pygame.display.gl_set_attribute(
             pygame.GL_CONTEXT_PROFILE_MASK, pygame.GL_CONTEXT_PROFILE_CORE)
 
-        # Set multi-sample buffer for MSAA
-        # pygame.display.gl_set_attribute(pygame.GL_MULTISAMPLEBUFFERS, 1)
+        # Set multi-sample buffer for MSAA, which can only be chosen
+        # before the window is created
+        if msaa_samples:
+            pygame.display.gl_set_attribute(pygame.GL_MULTISAMPLEBUFFERS, 1)
+            pygame.display.gl_set_attribute(
+                pygame.GL_MULTISAMPLESAMPLES, msaa_samples)
 
         # Configure pygame display
         self._screen_res = (screen_width, screen_height)
@@ -84,47 +134,74 @@ class RenderEngine:
 
         # Create screen layer
         self._screen = Layer(None, self._ctx.screen)
-        self._ctx.screen
 
-        # Read draw shader source files
-        vertex_src = resources.read_text(
-            'pygame_render', 'vertex.glsl')
-        fragment_src_draw = resources.read_text(
-            'pygame_render', 'fragment_draw.glsl')
+        # The draw and tone mapping shaders are only compiled on first use,
+        # since the default render path uses the instanced draw shader
+        self._shader_draw: Shader | None = None
+        self._shader_tonemap: Shader | None = None
+        self._exposure = 0.1
+        self._exposure_dirty = True
 
-        # Create draw shader program
+        # Read the instanced draw shader, which shares the draw fragment shader
+        vertex_src = _read_builtin_source('vertex_instanced.glsl')
+        fragment_src_draw = _read_builtin_source('fragment_draw.glsl')
+
+        # Create instanced draw shader program
         prog_draw = self._ctx.program(vertex_shader=vertex_src,
                                       fragment_shader=fragment_src_draw)
-        self._shader_draw = Shader(prog_draw)
+        self._shader_instanced = Shader(prog_draw)
+
+        # Texture bound to location 0 by the last render
+        self._bound_tex: Texture | None = None
+
+        # Framebuffer set as the render target by the last draw
+        self._bound_fbo: moderngl.Framebuffer | None = None
+
+        # Default shader renders deferred between begin_frame and end_frame,
+        # as (texture, layer, instance data) tuples
+        self._deferring = False
+        self._pending: list[tuple[Texture, Layer, tuple]] = []
+
+        # Ring of pixel buffers used to upload surfaces in update_texture
+        self._pbo_ring = [self._ctx.buffer(reserve=4, dynamic=True)
+                          for _ in range(3)]
+        self._pbo_index = 0
+
+        # Persistent VBO for the six vertices of the quad drawn by render_from_vertices
+        self._quad_vbo = self._ctx.buffer(reserve=6 * 4 * 4, dynamic=True)
+        self._quad_data = np.empty((6, 4), dtype=np.float32)
+
+        # Persistent VBO for the quads of render_batch_from_vertices, grown on demand
+        self._batch_vbo = self._ctx.buffer(reserve=64 * 4 * 4 * 4, dynamic=True)
+
+        # Staging array for the four vertices of each quad of render_batch_from_vertices,
+        # and the index buffer of their triangles, both grown on demand
+        self._batch_data = np.empty((64, 4, 4), dtype=np.float32)
+        self._batch_ibo = self._ctx.buffer(reserve=4, dynamic=True)
+        self._batch_ibo_quads = 0
+
+        # Unit quad shared by all the instances, as a triangle strip
+        # going top-left, top-right, bottom-left, bottom-right
+        self._unit_quad_vbo = self._ctx.buffer(
+            np.array([0, 0, 1, 0, 0, 1, 1, 1], dtype=np.float32))
+
+        # Instance data of a single render call with the default shader
+        self._single_instance = np.empty((1, 9), dtype=np.float32)
+
+        # Persistent VBO for the per-instance data of render_batch, grown on demand
+        self._instance_vbo = self._ctx.buffer(reserve=256 * 9 * 4, dynamic=True)
+        self._instance_vao = self._ctx.vertex_array(self._shader_instanced.program, [
+            (self._unit_quad_vbo, '2f', 'vertexCorner'),
+            (self._instance_vbo, '2f 2f 1f 4f/i', 'instanceCenter',
+             'instanceSize', 'instanceAngle', 'instanceSection'),
+        ])
 
-        # read the tone mapping shader
-        vertex_src = resources.read_text(
-            'pygame_render', 'vertex_tone.glsl')
-        fragment_src_draw = resources.read_text(
-            'pygame_render', 'fragment_tone.glsl')
+        # The primitive shader program and its vertex array are only created on first use
+        self._prog_prim: moderngl.Program | None = None
+        self._prim_vao: VertexArray | None = None
 
-        # Create draw shader program
-        prog_draw = self._ctx.program(vertex_shader=vertex_src,
-                                      fragment_shader=fragment_src_draw)        
-        self._shader_tonemap = Shader(prog_draw)
-        self._exposure: float
-        self.HDR_exposure = 0.1
-
-        # Create a shader program for drawing primitives
-        self.prog_prim = self.ctx.program(
-            vertex_shader='''
-            #version 330
-            in vec2 vert;
-            void main() {
-            gl_Position = vec4(vert.x, vert.y, 0.0, 1.0);
-            }''',
-            fragment_shader='''
-            #version 330
-            uniform vec4 primColor;
-            out vec4 color;
-            void main() {
-            color = primColor;
-            }''',)
+        # Persistent VBO for the vertices of the primitives, grown on demand
+        self._prim_vbo = self._ctx.buffer(reserve=256 * 2 * 4, dynamic=True)
 
     @property
     def screen(self) -> Layer:
@@ -142,8 +219,73 @@ class RenderEngine:
 
     @HDR_exposure.setter
     def HDR_exposure(self, value: float) -> None:
-        self._exposure = value
-        self._shader_tonemap['exposure'] = value
+        # The value is sent the next time the tone mapping shader is used
+        if value != self._exposure:
+            self._exposure = value
+            self._exposure_dirty = True
+
+    def _send_exposure(self) -> None:
+        """
+        Send the HDR exposure to the tone mapping shader.
+        """
+        self._exposure_dirty = False
+
+        # Fold the constants of exp(-color * exposure) into a single factor for exp2
+        self._shader_tonemap['exposureLog2e'] = -self._exposure * _LOG2_E
+
+    def _get_shader_draw(self) -> Shader:
+        """
+        Get the draw shader, compiling it on first use.
+        """
+        if self._shader_draw is None:
+            prog_draw = self._ctx.program(
+                vertex_shader=_read_builtin_source('vertex.glsl'),
+                fragment_shader=_read_builtin_source('fragment_draw.glsl'))
+            self._shader_draw = Shader(prog_draw)
+        return self._shader_draw
+
+    def _get_shader_tonemap(self) -> Shader:
+        """
+        Get the tone mapping shader, compiling it on first use.
+        """
+        if self._shader_tonemap is None:
+            prog_tonemap = self._ctx.program(
+                vertex_shader=_read_builtin_source('vertex_tone.glsl'),
+                fragment_shader=_read_builtin_source('fragment_tone.glsl'))
+            self._shader_tonemap = Shader(prog_tonemap)
+            self._send_exposure()
+        elif self._exposure_dirty:
+            self._send_exposure()
+        return self._shader_tonemap
+
+    @property
+    def prog_prim(self) -> moderngl.Program:
+        """Get the shader program for drawing primitives, compiling it on first use."""
+        if self._prog_prim is None:
+            self._prog_prim = self._ctx.program(
+                vertex_shader='''
+                #version 330
+                in vec2 vert;
+                void main() {
+                gl_Position = vec4(vert.x, vert.y, 0.0, 1.0);
+                }''',
+                fragment_shader='''
+                #version 330
+                uniform vec4 primColor;
+                out vec4 color;
+                void main() {
+                color = primColor;
+                }''',)
+        return self._prog_prim
+
+    def _get_prim_vao(self) -> VertexArray:
+        """
+        Get the vertex array of the primitive VBO, creating it on first use.
+        """
+        if self._prim_vao is None:
+            self._prim_vao = self._ctx.simple_vertex_array(
+                self.prog_prim, self._prim_vbo, 'vert')
+        return self._prim_vao
 
     def use_alpha_blending(self, enabled: bool) -> None:
         """
@@ -152,11 +294,122 @@ class RenderEngine:
         Args:
             enabled (bool): True to enable, False to disable premultiplied alpha blending.
         """
+
+        # Draw the renders deferred by begin_frame first, with the blending they were made with
+        self._flush_pending()
+
         if enabled:
             self._ctx.enable(moderngl.BLEND)
         else:
             self._ctx.disable(moderngl.BLEND)
 
+    def invalidate_state(self) -> None:
+        """
+        Forget the OpenGL state that the engine assumes to be bound.
+
+        The engine skips binding a texture or framebuffer that it already bound for the
+        previous draw. Call this after binding textures or framebuffers with moderngl directly
+        (e.g. Texture.use() or Framebuffer.use()), so that the next render binds everything again.
+        """
+        self._bound_tex = None
+        self._bound_fbo = None
+        Shader.forget_bound_textures()
+
+    def _use_texture(self, tex: Texture) -> None:
+        """
+        Bind a texture to location 0, unless it is already bound.
+        """
+        if self._bound_tex is not tex:
+            tex.use()
+            self._bound_tex = tex
+
+    def _use_framebuffer(self, fbo: moderngl.Framebuffer) -> None:
+        """
+        Set a framebuffer as the render target, unless it already is.
+        """
+        if self._bound_fbo is not fbo:
+            fbo.use()
+            self._bound_fbo = fbo
+
+    def begin_frame(self) -> None:
+        """
+        Start deferring the render calls that use the default shader until end_frame.
+
+        Deferred renders of the same texture onto the same layer are drawn together
+        in a single instanced draw call, instead of one draw call each.
+
+        Note:
+        - Any other draw (a custom shader, HDR, primitives, batches), RenderEngine.clear, and
+          use_alpha_blending first draw the deferred renders, so the drawing order is kept.
+        - Layer.clear and reading a layer do not go through the engine, so call end_frame before them.
+        """
+        self._deferring = True
+
+    def end_frame(self, sort: bool = False) -> None:
+        """
+        Draw the renders deferred since begin_frame and stop deferring.
+
+        Parameters:
+        - sort (bool): Whether to group the deferred renders by layer and texture before drawing them,
+          which reduces the number of draw calls but changes the order in which overlapping sprites
+          are drawn. Default is False.
+
+        Note: Sorting never moves a render that samples a layer's texture across the renders onto
+        that layer, so rendering into a layer and then drawing that layer still works.
+        """
+        self._flush_pending(sort)
+        self._deferring = False
+
+    def _flush_pending(self, sort: bool = False) -> None:
+        """
+        Draw the deferred renders, with one instanced draw call per run of the same texture and layer.
+        """
+        pending = self._pending
+        if not pending:
+            return
+        self._pending = []
+
+        if sort:
+            pending = self._sort_pending(pending)
+
+        for _, group in groupby(pending, key=lambda d: (id(d[0]), id(d[1]))):
+            group = list(group)
+            tex, layer, _ = group[0]
+            instance_data = np.array([d[2] for d in group], dtype=np.float32)
+            self._render_instances(tex, layer, instance_data)
+
+    def _sort_pending(self, pending: list[tuple[Texture, Layer, tuple]]) -> list[tuple[Texture, Layer, tuple]]:
+        """
+        Sort the deferred renders by layer and texture, without moving a render that samples
+        a layer across the renders onto that layer, or the other way around.
+        """
+        # Split the renders into segments, starting a new one whenever a render samples a layer
+        # drawn onto in the current segment, or draws onto a layer sampled in it
+        segments = []
+        segment = []
+        targets = set()
+        sampled = set()
+        for draw in pending:
+            tex, layer, _ = draw
+            target = layer.texture
+            if id(tex) in targets or (target is not None and id(target) in sampled):
+                segments.append(segment)
+                segment = []
+                targets.clear()
+                sampled.clear()
+            segment.append(draw)
+            sampled.add(id(tex))
+            if target is not None:
+                targets.add(id(target))
+        segments.append(segment)
+
+        # Python's sort is stable, so the order within each group is kept
+        result = []
+        for segment in segments:
+            segment.sort(key=lambda d: (d[1].framebuffer.glo, d[0].glo))
+            result.extend(segment)
+        return result
+
     def surface_to_texture(self, sfc: pygame.Surface) -> moderngl.Texture:
         """
         Convert a pygame.Surface to a moderngl.Texture.
@@ -168,13 +421,50 @@ class RenderEngine:
             moderngl.Texture: Converted texture.
         """
 
-        img_flip = pygame.transform.flip(sfc, False, True)
-        img_data = pygame.image.tostring(img_flip, "RGBA")
+        # Read the pixels flipped vertically in a single pass, which avoids
+        # making an intermediate flipped copy of the surface
+        img_data = pygame.image.tostring(sfc, "RGBA", True)
 
-        tex = self._ctx.texture(sfc.get_size(), components=4, data=img_data)
+        # RGBA rows are always a multiple of 4 bytes long, so they can be unpacked
+        # with 4-byte alignment without any padding
+        tex = self._ctx.texture(sfc.get_size(), components=4, data=img_data, alignment=4)
         tex.filter = (moderngl.NEAREST, moderngl.NEAREST)
         return tex
 
+    def update_texture(self, tex: moderngl.Texture, sfc: pygame.Surface) -> None:
+        """
+        Overwrite the pixels of an existing texture with a pygame.Surface.
+
+        The surface is uploaded through a small ring of pixel buffer objects, so the
+        driver can copy it into the texture asynchronously. Reusing one texture this
+        way is much cheaper than creating a new one every frame with surface_to_texture.
+
+        Args:
+            tex (moderngl.Texture): RGBA texture to overwrite. It must be at least as large as the surface.
+            sfc (pygame.Surface): Surface to upload.
+
+        Note:
+        - The surface is written into the section pygame.Rect(0, 0, width, height) of the texture,
+          which is the section to pass to render to draw it.
+        """
+
+        # Draw the renders deferred by begin_frame first, to keep the drawing order
+        self._flush_pending()
+
+        width, height = sfc.get_size()
+        assert width <= tex.width and height <= tex.height, f'Error: The surface of size {(width, height)} does not fit in the texture of size {tex.size}. Please ensure the texture is at least as large as the surface.'
+        img_data = pygame.image.tostring(sfc, "RGBA", True)
+
+        # Pick the next pixel buffer, growing it if the surface does not fit
+        pbo = self._pbo_ring[self._pbo_index]
+        self._pbo_index = (self._pbo_index + 1) % len(self._pbo_ring)
+        if pbo.size < len(img_data):
+            pbo.orphan(len(img_data))
+
+        # Copy the pixels into the buffer, then from the buffer into the texture
+        pbo.write(img_data)
+        tex.write(pbo, viewport=(0, 0, width, height), alignment=4)
+
     def load_texture(self, path: str) -> moderngl.Texture:
         """
         Load a texture from a file.
@@ -206,7 +496,8 @@ class RenderEngine:
         - data (bytes | None): Optional initial data for the texture. If None, the texture data is uninitialized.
         - samples (int): The number of samples. Value 0 means no multisample format.
         - alignment (int): The byte alignment 1, 2, 4 or 8.
-        - dtype (str): Data type ('f4' for HDR textures).
+        - dtype (str): Data type ('f2' or 'f4' for HDR textures). Half floats ('f2') use half the memory
+          and bandwidth of 'f4' and are precise enough for HDR colors, so prefer them unless more range is needed.
         - internal_format (int): Override the internal format of the texture (IF needed).
 
         Returns:
@@ -238,6 +529,54 @@ class RenderEngine:
         shader = Shader(prog)
         return shader
 
+    def make_batch(self,
+                   tex: Texture,
+                   positions: np.ndarray,
+                   scales: np.ndarray | tuple[float, float] | float = 1.0,
+                   angles: np.ndarray | float = 0.0,
+                   flips: np.ndarray | tuple[bool, bool] | bool = False,
+                   sections: np.ndarray | pygame.Rect | None = None,
+                   shader: Shader = None) -> Batch:
+        """
+        Create a batch of copies of a texture whose transforms are uploaded to the GPU once.
+
+        The arguments describe the copies exactly like in render_batch_arrays. Render the batch
+        with render_prepared_batch, which only draws it, so use this for transforms that do not
+        change between frames.
+
+        Parameters:
+        - tex (Texture): The texture to render.
+        - positions (np.ndarray): Array of shape (N, 2) with the position (x, y) of each copy.
+        - scales (np.ndarray | tuple[float, float] | float): The scale of each copy, or a value shared by all copies. Default is 1.0.
+        - angles (np.ndarray | float): The rotation angle of each copy in degrees, or an angle shared by all copies. Default is 0.0.
+        - flips (np.ndarray | tuple[bool, bool] | bool): The flip of each copy, or a flip shared by all copies. Default is False.
+        - sections (np.ndarray | pygame.Rect | None): The section of each copy, or a section shared by all copies. Default is None.
+        - shader (Shader): The shader program to use for rendering. If None, a default shader is used. Default is None.
+
+        Returns:
+        - Batch
+
+        Note: A custom shader must expand the instances itself, reading the same attributes
+        and layerSize uniform as the default instanced vertex shader (vertex_instanced.glsl).
+        """
+        if shader == None:
+            shader = self._shader_instanced
+
+        instance_data, _ = self._make_instance_data(
+            tex, positions, scales, angles, flips, sections)
+
+        # ModernGL buffers cannot be empty, so an empty batch reserves room for one instance
+        if len(instance_data) == 0:
+            vbo = self._ctx.buffer(reserve=instance_data.itemsize * 9)
+        else:
+            vbo = self._ctx.buffer(instance_data)
+        vao = self._ctx.vertex_array(shader.program, [
+            (self._unit_quad_vbo, '2f', 'vertexCorner'),
+            (vbo, '2f 2f 1f 4f/i', 'instanceCenter',
+             'instanceSize', 'instanceAngle', 'instanceSection'),
+        ])
+        return Batch(tex, shader, vbo, vao, len(instance_data))
+
     def load_shader_from_path(self, vertex_path: str, fragment_path: str) -> Shader:
         """
         Loads shader source code from specified file paths and creates a shader program.
@@ -249,10 +588,8 @@ class RenderEngine:
         Returns:
         - A Shader object representing the compiled shader program.
         """
-        with open(vertex_path) as f:
-            vertex_src = f.read()
-        with open(fragment_path) as f:
-            fragment_src = f.read()
+        vertex_src = _read_source_file(vertex_path)
+        fragment_src = _read_source_file(fragment_path)
 
         return self.make_shader(vertex_src, fragment_src)
 
@@ -264,14 +601,20 @@ class RenderEngine:
         - shader (Shader): The shader program for which the uniform block will be reserved.
         - ubo_name (str): The name of the uniform block in the shader program.
         - nbytes (int): The size, in bytes, to reserve for the uniform block in the buffer.
+
+        Note: Reserving a uniform block again reuses its buffer if it is large enough,
+        so calling this method every frame does not allocate new buffers.
         """
-        # Program's GL object
-        prog_glo = shader.program.glo
+        # Reuse the uniform block if it was already reserved with enough memory
+        old_ubo = shader.get_ubo(ubo_name)
+        if old_ubo is not None:
+            if old_ubo.size >= nbytes:
+                return
+            old_ubo.release()
 
         # Bind uniform block to given binding
         binding = shader.sample_ubo_binding()
-        block_index = glGetUniformBlockIndex(prog_glo, ubo_name)
-        glUniformBlockBinding(prog_glo, block_index, binding)
+        shader.program[ubo_name].binding = binding
 
         # Create the uniform block
         ubo = self.ctx.buffer(reserve=nbytes)
@@ -288,8 +631,11 @@ class RenderEngine:
             B (int): Blue component value (0-255).
             A (int): Alpha component value (0-255).
         """
-        R, G, B, A = normalize_color_arguments(R, G, B, A)
-        self._ctx.screen.clear(R, G, B, A)
+
+        # Draw the renders deferred by begin_frame first, to keep the drawing order
+        self._flush_pending()
+
+        self._screen.clear(R, G, B, A)
 
     def render(self,
                tex: Texture,
@@ -327,12 +673,16 @@ class RenderEngine:
         - If hdr_render is True, it uses an HDR texture with tone mapping applied.        
         """
 
-        # Create section rect if none
-        if section == None:
-            section = pygame.Rect(0, 0, tex.width, tex.height)
+        # Unpack the section, which is the entire texture if none,
+        # without creating a rect
+        tex_w, tex_h = tex.size
+        if section is None:
+            sec_x, sec_y, sec_w, sec_h = 0, 0, tex_w, tex_h
+        else:
+            sec_x, sec_y, sec_w, sec_h = section
 
         # If the scale is not a tuple but a scalar, convert it into a tuple
-        if isinstance(scale, numbers.Number):
+        if not isinstance(scale, tuple) and isinstance(scale, numbers.Number):
             scale = (scale, scale)
 
         # If flip is not a tuple but a boolean, convert it into a tuple
@@ -340,23 +690,331 @@ class RenderEngine:
             flip = (flip, False)
 
         if hdr_render:
-            shader = self._shader_tonemap            
+            shader = self._get_shader_tonemap()            
+
+        # With the default shader, only the transform is uploaded and
+        # the vertex shader builds the rotated rectangle
+        if shader is None:
+            w = scale[0] * sec_w
+            h = scale[1] * sec_h
+            inv_w, inv_h = 1. / tex_w, 1. / tex_h
+            instance = (position[0] + w / 2, position[1] + h / 2,
+                        -w if flip[0] else w, -h if flip[1] else h,
+                        radians(angle),
+                        sec_x * inv_w, sec_y * inv_h,
+                        sec_w * inv_w, sec_h * inv_h)
+
+            # Between begin_frame and end_frame, draw it later with the others
+            if self._deferring:
+                self._pending.append((tex, layer, instance))
+                return
+
+            self._single_instance[0] = instance
+            self._render_instances(tex, layer, self._single_instance)
+            return
 
         # Get the vertex coordinates of a rectangle that has been rotated,
         # scaled, and translated, in world coordinates
-        dest_vertices = create_rotated_rect(position, section.width,
-                                            section.height, scale, angle, flip)
+        dest_vertices = create_rotated_rect(position, sec_w, sec_h,
+                                            scale, angle, flip)
 
         # Convert the section rectangle into a list of vertices
-        section_vertices = [(section.x, section.y),
-                            (section.x + section.width, section.y),
-                            (section.x, section.y + section.height),
-                            (section.x + section.width, section.y + section.height)]
+        section_vertices = [(sec_x, sec_y),
+                            (sec_x + sec_w, sec_y),
+                            (sec_x, sec_y + sec_h),
+                            (sec_x + sec_w, sec_y + sec_h)]
 
         # Render the texture
         self.render_from_vertices(
             tex, layer, dest_vertices, section_vertices, shader)
 
+    def render_batch(self,
+                     tex: Texture,
+                     layer: Layer,
+                     transforms: list[dict],
+                     shader: Shader = None,
+                     hdr_render: bool = False) -> None:
+        """
+        Render many copies of a texture onto a layer in a single draw call.
+
+        Parameters:
+        - tex (Texture): The texture to render.
+        - layer (Layer): The layer to render onto.
+        - transforms (list[dict]): One dictionary per copy of the texture. The keys 'position', 'scale',
+          'angle', 'flip', and 'section' are optional and behave like the arguments of the same name in render.
+        - shader (Shader): The shader program to use for rendering. If None, a default shader is used. Default is None.
+        - hdr_render (bool): Whether to render using HDR texture with tone mapping. Default is False (SDR).
+
+        Returns:
+        None
+
+        Note:
+        - All copies share the same texture, layer, and shader, so uniforms cannot vary between them.
+        - Prefer this method over calling render in a loop when drawing many sprites.
+        - If the transforms are already stored in arrays, render_batch_arrays avoids building the dictionaries.
+        """
+
+        # Nothing to draw
+        if not transforms:
+            return
+
+        # Gather the transforms into one row of parameters each, filling in the defaults
+        full_section = (0, 0, *tex.size)
+        params = []
+        for transform in transforms:
+            get = transform.get
+            position = get('position', (0, 0))
+            scale = get('scale', (1.0, 1.0))
+            flip = get('flip', (False, False))
+            section = get('section', None)
+
+            # If the scale is not a tuple but a scalar, convert it into a tuple
+            if not isinstance(scale, tuple) and isinstance(scale, numbers.Number):
+                scale = (scale, scale)
+
+            # If flip is not a tuple but a boolean, convert it into a tuple
+            if isinstance(flip, bool):
+                flip = (flip, False)
+
+            if section is None:
+                section = full_section
+
+            params.append((position[0], position[1], scale[0], scale[1], get('angle', 0.0),
+                           flip[0], flip[1], section[0], section[1], section[2], section[3]))
+
+        self.render_many(tex, layer, params, shader, hdr_render)
+
+    def render_batch_arrays(self,
+                            tex: Texture,
+                            layer: Layer,
+                            positions: np.ndarray,
+                            scales: np.ndarray | tuple[float, float] | float = 1.0,
+                            angles: np.ndarray | float = 0.0,
+                            flips: np.ndarray | tuple[bool, bool] | bool = False,
+                            sections: np.ndarray | pygame.Rect | None = None,
+                            shader: Shader = None,
+                            hdr_render: bool = False) -> None:
+        """
+        Render many copies of a texture onto a layer in a single draw call, given the transforms as arrays.
+
+        Parameters:
+        - tex (Texture): The texture to render.
+        - layer (Layer): The layer to render onto.
+        - positions (np.ndarray): Array of shape (N, 2) with the position (x, y) of each copy.
+        - scales (np.ndarray | tuple[float, float] | float): Array of shape (N, 2) or (N,) with the scale of each copy,
+          or a tuple (x, y) or scalar shared by all copies. Default is 1.0.
+        - angles (np.ndarray | float): Array of shape (N,) with the rotation angle of each copy in degrees,
+          or an angle shared by all copies. Default is 0.0.
+        - flips (np.ndarray | tuple[bool, bool] | bool): Array of shape (N, 2) or (N,) with the flip of each copy,
+          or a tuple (flip x axis, flip y axis) or boolean shared by all copies. Default is False.
+        - sections (np.ndarray | pygame.Rect | None): Array of shape (N, 4) with the section (x, y, width, height)
+          of each copy, or a pygame.Rect shared by all copies. If None, the entire texture is rendered. Default is None.
+        - shader (Shader): The shader program to use for rendering. If None, a default shader is used. Default is None.
+        - hdr_render (bool): Whether to render using HDR texture with tone mapping. Default is False (SDR).
+
+        Returns:
+        None
+
+        Note:
+        - One-dimensional scales and flips hold one value per copy; a scale applies to both axes and a flip only to the x axis.
+        - Shared values must be given as tuples or scalars, not as arrays.
+        """
+
+        # Draw the renders deferred by begin_frame first, to keep the drawing order
+        self._flush_pending()
+
+        if hdr_render:
+            shader = self._get_shader_tonemap()
+
+        instance_data, sections = self._make_instance_data(
+            tex, positions, scales, angles, flips, sections)
+
+        # Nothing to draw
+        if len(instance_data) == 0:
+            return
+
+        # With the default shader, the quads are built on the GPU
+        if shader is None:
+            self._render_instances(tex, layer, instance_data)
+            return
+
+        # Otherwise, build the quads on the CPU
+        dest_vertices = create_rotated_rects(instance_data[:, 0:2],
+                                             instance_data[:, 2:4],
+                                             instance_data[:, 4])
+        x, y, w, h = sections.T
+        section_vertices = np.stack([np.stack([x, y], axis=-1),
+                                     np.stack([x + w, y], axis=-1),
+                                     np.stack([x, y + h], axis=-1),
+                                     np.stack([x + w, y + h], axis=-1)], axis=1)
+
+        # Render all the quads at once
+        self.render_batch_from_vertices(
+            tex, layer, dest_vertices, section_vertices, shader)
+
+    def render_many(self,
+                    tex: Texture,
+                    layer: Layer,
+                    params: np.ndarray,
+                    shader: Shader = None,
+                    hdr_render: bool = False) -> None:
+        """
+        Render many copies of a texture onto a layer in a single draw call, given one row of parameters per copy.
+
+        Parameters:
+        - tex (Texture): The texture to render.
+        - layer (Layer): The layer to render onto.
+        - params (np.ndarray): Array of shape (N, 7) or (N, 11) whose columns are the position (x, y), the scale (x, y),
+          the rotation angle in degrees, the flip (x, y) as 0 or 1, and optionally the section (x, y, width, height).
+        - shader (Shader): The shader program to use for rendering. If None, a default shader is used. Default is None.
+        - hdr_render (bool): Whether to render using HDR texture with tone mapping. Default is False (SDR).
+
+        Returns:
+        None
+
+        Note:
+        - Without the section columns, the entire texture is rendered.
+        - This is a shorthand for render_batch_arrays for transforms kept in a single array.
+        """
+        params = np.asarray(params, dtype=np.float32)
+
+        # Nothing to draw
+        if len(params) == 0:
+            return
+
+        sections = params[:, 7:11] if params.shape[1] >= 11 else None
+        self.render_batch_arrays(tex, layer, params[:, 0:2], params[:, 2:4], params[:, 4],
+                                 params[:, 5:7] != 0, sections, shader, hdr_render)
+
+    def render_prepared_batch(self, batch: Batch, layer: Layer) -> None:
+        """
+        Render a batch created with make_batch onto a layer in a single draw call.
+
+        Parameters:
+        - batch (Batch): The batch to render.
+        - layer (Layer): The layer to render onto.
+
+        Returns:
+        None
+        """
+
+        # Draw the renders deferred by begin_frame first, to keep the drawing order
+        self._flush_pending()
+
+        # Nothing to draw
+        if batch.count == 0:
+            return
+
+        shader = batch.shader
+
+        # Send the layer size to convert into destination coordinates
+        shader['layerSize'] = layer.size
+
+        # Use textures
+        self._use_texture(batch.texture)
+        shader.bind_sampler2D_uniforms()
+
+        # Set layer as target
+        self._use_framebuffer(layer.framebuffer)
+
+        # Render
+        batch.vertex_array.render(
+            moderngl.TRIANGLE_STRIP, instances=batch.count)
+
+    def _make_instance_data(self,
+                            tex: Texture,
+                            positions: np.ndarray,
+                            scales: np.ndarray | tuple[float, float] | float,
+                            angles: np.ndarray | float,
+                            flips: np.ndarray | tuple[bool, bool] | bool,
+                            sections: np.ndarray | pygame.Rect | None) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Pack the transforms of render_batch_arrays into per-instance data.
+
+        Returns:
+        - np.ndarray: Float32 array of shape (N, 9) with the center (2), signed size (2),
+          angle in radians (1), and texture section in texture coordinates (4) of each copy.
+        - np.ndarray: Float32 array of shape (N, 4) with the section of each copy in pixels.
+        """
+        positions = np.asarray(positions, dtype=np.float32).reshape(-1, 2)
+        n = len(positions)
+
+        # Broadcast the scales into an (N, 2) array
+        if isinstance(scales, tuple):
+            scales = np.asarray(scales, dtype=np.float32)
+        else:
+            scales = np.asarray(scales, dtype=np.float32)
+            if scales.ndim < 2:
+                scales = np.stack([scales, scales], axis=-1)
+        scales = np.broadcast_to(scales, (n, 2))
+
+        # Broadcast the flips into an (N, 2) array
+        if isinstance(flips, tuple):
+            flips = np.asarray(flips, dtype=bool)
+        else:
+            flips = np.asarray(flips, dtype=bool)
+            if flips.ndim < 2:
+                flips = np.stack([flips, np.zeros_like(flips)], axis=-1)
+        flips = np.broadcast_to(flips, (n, 2))
+
+        # Broadcast the sections into an (N, 4) array
+        tex_w, tex_h = tex.size
+        if sections is None:
+            sections = (0, 0, tex_w, tex_h)
+        elif isinstance(sections, pygame.Rect):
+            sections = (sections.x, sections.y,
+                        sections.width, sections.height)
+        sections = np.broadcast_to(
+            np.asarray(sections, dtype=np.float32).reshape(-1, 4), (n, 4))
+
+        angles = np.broadcast_to(np.asarray(angles, dtype=np.float32), (n,))
+
+        # Pack center, signed size, angle, and texture section of each copy
+        sizes = scales * sections[:, 2:]
+        instance_data = np.empty((n, 9), dtype=np.float32)
+        instance_data[:, 0:2] = positions + sizes / 2
+        instance_data[:, 2:4] = np.where(flips, -sizes, sizes)
+        instance_data[:, 4] = np.radians(angles)
+        instance_data[:, 5:9] = sections / \
+            np.array([tex_w, tex_h, tex_w, tex_h],
+                     dtype=np.float32)
+        return instance_data, sections
+
+    def _render_instances(self,
+                          tex: Texture,
+                          layer: Layer,
+                          instance_data: np.ndarray) -> None:
+        """
+        Render many copies of a texture with the default shader using instancing.
+
+        Only the per-instance data is uploaded; the vertex shader expands
+        a shared unit quad into each rotated, scaled, and flipped rectangle.
+
+        Parameters:
+        - tex (Texture): The texture to render.
+        - layer (Layer): The layer to render onto.
+        - instance_data (np.ndarray): Float32 array of shape (N, 9) with the center (2), signed size (2),
+          angle in radians (1), and texture section in texture coordinates (4) of each copy.
+        """
+
+        # Write the instance data into fresh storage of the persistent instance VBO, growing it if needed
+        self._instance_vbo.orphan(
+            max(self._instance_vbo.size, instance_data.nbytes))
+        self._instance_vbo.write(instance_data)
+
+        # Send the layer size to convert into destination coordinates
+        self._shader_instanced['layerSize'] = layer.size
+
+        # Use texture
+        self._use_texture(tex)
+
+        # Set layer as target
+        self._use_framebuffer(layer.framebuffer)
+
+        # Render
+        self._instance_vao.render(
+            moderngl.TRIANGLE_STRIP, instances=len(instance_data))
+
     def render_from_vertices(self,
                              tex: Texture,
                              layer: Layer,
@@ -377,57 +1035,106 @@ class RenderEngine:
         None
         """
 
+        # Draw the renders deferred by begin_frame first, to keep the drawing order
+        self._flush_pending()
+
         # Default to draw shader program if none
-        if shader == None:
-            shader = self._shader_draw
+        if shader is None:
+            shader = self._get_shader_draw()
+
+        # Interleave the destination and texture coordinates of the two triangles
+        buffer_data = self._quad_data
+        buffer_data[:, :2] = to_dest_coords_array(
+            dest_vertices, *layer.size)[QUAD_DEST_INDICES]
+        buffer_data[:, 2:] = to_source_coords_array(
+            section_vertices, *tex.size)[QUAD_SECTION_INDICES]
+
+        # Write the vertices into fresh storage of the persistent quad VBO, so
+        # the write does not wait for previous draws that still read from it
+        self._quad_vbo.orphan()
+        self._quad_vbo.write(buffer_data)
+        vao = shader.quad_vertex_array(self._quad_vbo)
 
-        # Convert to destination coordinates
-        vertex_coords = [to_dest_coords(
-            p, layer.width, layer.height) for p in dest_vertices]
+        # Use textures
+        self._use_texture(tex)
+        shader.bind_sampler2D_uniforms()
 
-        # Mesh for destination rect on screen
-        p1, p2, p3, p4 = vertex_coords
-        vertex_data = np.array([p3, p4, p2,
-                                p2, p4, p1], dtype=np.float32)
+        # Set layer as target
+        self._use_framebuffer(layer.framebuffer)
 
-        # Calculate the texture coordinates
-        section_coords = [to_source_coords(
-            p, tex.width, tex.height) for p in section_vertices]
+        # Render
+        vao.render()
 
-        # Mesh for the section within the texture
-        p1, p2, p3, p4 = section_coords
-        section_data = np.array([p3, p4, p1,
-                                 p1, p4, p2], dtype=np.float32)
+    def render_batch_from_vertices(self,
+                                   tex: Texture,
+                                   layer: Layer,
+                                   dest_vertices_list: list[list[(float, float)]],
+                                   section_vertices_list: list[list[(float, float)]],
+                                   shader: Shader = None) -> None:
+        """
+        Render several quads of a texture onto a layer in a single draw call given lists of vertices.
 
-        # Create VBO and VAO
-        buffer_data = np.hstack([vertex_data, section_data])
+        Parameters:
+        - tex (Texture): The texture to render.
+        - layer (Layer): The layer to render onto.
+        - dest_vertices_list (list[list[(float, float)]]): The destination coordinates of each quad on the target layer.
+        - section_vertices_list (list[list[(float, float)]]): The section of the texture to render for each quad.
+        - shader (Shader): The shader program to use for rendering. If None, a default shader is used. Default is None.
 
-        vbo = self._ctx.buffer(buffer_data)
-        vao = self._ctx.vertex_array(shader.program, [
-            (vbo, '2f 2f', 'vertexPos', 'vertexTexCoord'),
-        ])
+        Returns:
+        None
+        """
+
+        # Draw the renders deferred by begin_frame first, to keep the drawing order
+        self._flush_pending()
+
+        # Nothing to draw
+        if len(dest_vertices_list) == 0:
+            return
+
+        # Default to draw shader program if none
+        if shader is None:
+            shader = self._get_shader_draw()
+
+        # Interleave the destination and texture coordinates of the four vertices of every quad
+        dest_coords = to_dest_coords_array(
+            dest_vertices_list, *layer.size)
+        section_coords = to_source_coords_array(
+            section_vertices_list, *tex.size)
+        n = len(dest_coords)
+        if len(self._batch_data) < n:
+            self._batch_data = np.empty((2 * n, 4, 4), dtype=np.float32)
+        buffer_data = self._batch_data[:n]
+        buffer_data[..., :2] = dest_coords[:, QUAD_VERTEX_DEST_INDICES]
+        buffer_data[..., 2:] = section_coords[:, QUAD_VERTEX_SECTION_INDICES]
+
+        # Grow the shared index buffer if it does not cover all the quads
+        if self._batch_ibo_quads < n:
+            self._batch_ibo_quads = max(64, 2 * n)
+            indices = QUAD_TRIANGLE_INDICES + \
+                4 * np.arange(self._batch_ibo_quads, dtype=np.uint32)[:, None]
+            self._batch_ibo.orphan(indices.nbytes)
+            self._batch_ibo.write(indices)
+
+        # Write the vertices into fresh storage of the persistent batch VBO, growing it if needed
+        self._batch_vbo.orphan(max(self._batch_vbo.size, buffer_data.nbytes))
+        self._batch_vbo.write(buffer_data)
+        vao = shader.quad_vertex_array(self._batch_vbo, self._batch_ibo)
 
         # Use textures
-        tex.use()
+        self._use_texture(tex)
         shader.bind_sampler2D_uniforms()
 
         # Set layer as target
-        layer.framebuffer.use()
+        self._use_framebuffer(layer.framebuffer)
 
         # Render
-        vao.render()
-
-        # Clear the sampler2D locations
-        shader.clear_sampler2D_uniforms()
-
-        # Free vertex data
-        vbo.release()
-        vao.release()
+        vao.render(vertices=6 * n)
 
     def render_primitive(self,
                          layer: Layer,
                          color: tuple,
-                         vertices: list[tuple[float, float]],
+                         vertices: list[tuple[float, float]] | np.ndarray,
                          antialias: bool = False,
                          mode: int = moderngl.LINES):
         """
@@ -435,48 +1142,39 @@ class RenderEngine:
 
         :param layer: The rendering layer.
         :param color: The color of the primitive in (R, G, B) or (R, G, B, A) format.
-        :param vertices: A list of vertex coordinates as (x, y) tuples.
-        :param antialias: Enables antialiasing if True.
+        :param vertices: A list of vertex coordinates as (x, y) tuples, or an array of shape (N, 2).
+        :param antialias: Unused, kept for compatibility. Create the engine with msaa_samples to antialias the screen.
         :param mode: The rendering mode (e.g., LINES, TRIANGLES).
         """
+
+        # Draw the renders deferred by begin_frame first, to keep the drawing order
+        self._flush_pending()
+
         if len(color) == 3:
             color = (color[0], color[1], color[2], 255)
 
-        # Enable MSAA
-        if antialias:
-            pygame.display.gl_set_attribute(pygame.GL_MULTISAMPLESAMPLES, 4)
-
         # Convert to destination coordinates
         dest_width, dest_height = layer.size
-        dest_vertices = np.array(
-            [to_dest_coords(v, dest_width, dest_height) for v in vertices])
+        dest_vertices = to_dest_coords_array(
+            vertices, dest_width, dest_height).astype(np.float32)
 
-        # VBO and VAO
-        vbo = self.ctx.buffer(dest_vertices.astype('f4').tobytes())
-        vao = self.ctx.simple_vertex_array(
-            self.prog_prim, vbo, 'vert')
+        # Write the vertices into fresh storage of the persistent primitive VBO, growing it if needed
+        self._prim_vbo.orphan(max(self._prim_vbo.size, dest_vertices.nbytes))
+        self._prim_vbo.write(dest_vertices)
 
         # Send color uniform
         self.prog_prim['primColor'] = color
 
         # Set layer as target
-        layer.framebuffer.use()
+        self._use_framebuffer(layer.framebuffer)
 
         # Render
-        vao.render(mode)
-
-        # Disable MSAA
-        if antialias:
-            pygame.display.gl_set_attribute(pygame.GL_MULTISAMPLESAMPLES, 1)
-
-        # Free vertex data
-        vbo.release()
-        vao.release()
+        self._get_prim_vao().render(mode, vertices=len(dest_vertices))
 
     def render_triangles(self,
                          layer: Layer,
                          color: tuple,
-                         vertices: list[tuple[float, float]],
+                         vertices: list[tuple[float, float]] | np.ndarray,
                          antialias: bool = False,
                          strip: bool = False,
                          fan: bool = False):
@@ -485,8 +1183,8 @@ class RenderEngine:
 
         :param layer: The rendering layer.
         :param color: The color of the triangles in (R, G, B) or (R, G, B, A) format.
-        :param vertices: A list of vertex coordinates as (x, y) tuples.
-        :param antialias: Enables antialiasing if True.
+        :param vertices: A list of vertex coordinates as (x, y) tuples, or an array of shape (N, 2).
+        :param antialias: Unused, kept for compatibility. Create the engine with msaa_samples to antialias the screen.
         :param strip: If True, uses TRIANGLE_STRIP mode.
         :param fan: If True, uses TRIANGLE_FAN mode.
         """
@@ -508,7 +1206,7 @@ class RenderEngine:
     def render_lines(self,
                      layer: Layer,
                      color: tuple[float, float, float],
-                     vertices: list[tuple[float, float]],
+                     vertices: list[tuple[float, float]] | np.ndarray,
                      antialias: bool = False,
                      strip: bool = False):
         """
@@ -516,8 +1214,8 @@ class RenderEngine:
 
         :param layer: The rendering layer.
         :param color: The color of the lines in (R, G, B) or (R, G, B, A) format.
-        :param vertices: A list of vertex coordinates as (x, y) tuples.
-        :param antialias: Enables antialiasing if True.
+        :param vertices: A list of vertex coordinates as (x, y) tuples, or an array of shape (N, 2).
+        :param antialias: Unused, kept for compatibility. Create the engine with msaa_samples to antialias the screen.
         :param strip: If True, uses LINE_STRIP mode.
         """
         # Pick the flag for the render mode
@@ -546,7 +1244,7 @@ class RenderEngine:
         :param radius: The radius of the arc.
         :param angle1: The starting angle of the arc in degrees.
         :param angle2: The ending angle of the arc in degrees.
-        :param antialias: Enables antialiasing if True.
+        :param antialias: Unused, kept for compatibility. Create the engine with msaa_samples to antialias the screen.
         :param num_segments: The number of segments to use for the arc. If None, defaults to a smooth arc.
         """
         # Ensure the arc always goes the shortest route
@@ -562,17 +1260,13 @@ class RenderEngine:
         angle1 = np.radians(angle1)
         angle2 = np.radians(angle2)
 
-        # Include the center as the first vertex to render with TRIANGLE_FAN
-        vertices = [center]
-
-        # Generate the vertices
-        for angle in np.linspace(angle1, angle2, num_segments + 1):
-
-            # Calculate the x and y coordinates for each vertex
-            x = center[0] + radius * cos(angle)
-            y = center[1] + radius * sin(angle)
-
-            vertices.append((x, y))
+        # Generate the vertices, including the center as the first vertex
+        # to render with TRIANGLE_FAN
+        angles = np.linspace(angle1, angle2, num_segments + 1)
+        vertices = np.empty((num_segments + 2, 2))
+        vertices[0] = center
+        vertices[1:, 0] = center[0] + radius * np.cos(angles)
+        vertices[1:, 1] = center[1] + radius * np.sin(angles)
 
         # Render a triangle fan with the vertices
         self.render_primitive(layer, color, vertices,
@@ -592,9 +1286,18 @@ class RenderEngine:
         :param color: The color of the circle in (R, G, B) or (R, G, B, A) format.
         :param center: The center of the circle as (x, y) tuple.
         :param radius: The radius of the circle.
-        :param antialias: Enables antialiasing if True.
+        :param antialias: Unused, kept for compatibility. Create the engine with msaa_samples to antialias the screen.
         :param num_segments: The number of segments to use for the circle. If None, defaults to a smooth circle.
         """
+        # Smooth circles reuse the cached unit circle instead of recomputing it
+        if num_segments is None:
+            vertices = np.empty((len(_UNIT_CIRCLE) + 1, 2))
+            vertices[0] = center
+            vertices[1:] = center + radius * _UNIT_CIRCLE
+            self.render_primitive(layer, color, vertices,
+                                  antialias, moderngl.TRIANGLE_FAN)
+            return
+
         self.render_circle_arc(layer, color, center, radius,
                                0, 360, antialias, num_segments)
 
@@ -615,8 +1318,17 @@ class RenderEngine:
         :param width: The width of the rectangle.
         :param height: The height of the rectangle.
         :param angle: The rotation angle of the rectangle in degrees.
-        :param antialias: Enables antialiasing if True.
+        :param antialias: Unused, kept for compatibility. Create the engine with msaa_samples to antialias the screen.
         """
+        # Axis-aligned rectangles do not need to be rotated
+        if angle == 0:
+            x, y = position
+            vertices = np.array([(x, y + height), (x, y),
+                                 (x + width, y + height), (x + width, y)])
+            self.render_primitive(layer, color, vertices,
+                                  antialias, moderngl.TRIANGLE_STRIP)
+            return
+
         vertices = create_rotated_rect(
             position, width, height, [1, 1], angle, [False, False])
         v1, v2, v3, v4 = vertices
@@ -640,35 +1352,49 @@ class RenderEngine:
         :param p2: The ending point of the line as (x, y) tuple.
         :param thickness: The thickness of the line.
         :param capped: If True, adds caps at the ends of the line.
-        :param antialias: Enables antialiasing if True.
+        :param antialias: Unused, kept for compatibility. Create the engine with msaa_samples to antialias the screen.
         """
         # Calculate direction vector and normalize it
-        direction = (p2[0]-p1[0], p2[1]-p1[1])
-        direction_norm = np.linalg.norm(direction)
-        direction = direction / direction_norm
+        dx, dy = p2[0] - p1[0], p2[1] - p1[1]
+        norm = hypot(dx, dy)
+
+        # A line without length has no direction: only its caps are visible
+        if norm == 0:
+            if capped:
+                self.render_circle(layer, color, p1, thickness / 2, antialias)
+            return
+
+        inv_norm = 1. / norm
+        dx, dy = dx * inv_norm, dy * inv_norm
 
         # Calculate the perpendicular vector
         h_thickness = thickness / 2
-        perpendicular = np.array([-direction[1], direction[0]]) * h_thickness
+        px, py = -dy * h_thickness, dx * h_thickness
+
+        # A capped line is convex, so draw its outline as a single triangle fan around its middle:
+        # the half circle around p2 from -perpendicular to +perpendicular, then the one around p1 back
+        if capped:
+            p1 = np.asarray(p1, dtype=np.float64)
+            p2 = np.asarray(p2, dtype=np.float64)
+            forward = np.array((dx * h_thickness, dy * h_thickness))
+            perpendicular = np.array((px, py))
+            cap2 = p2 + _HALF_CIRCLE_SIN * forward - _HALF_CIRCLE_COS * perpendicular
+            cap1 = p1 + _HALF_CIRCLE_COS * perpendicular - _HALF_CIRCLE_SIN * forward
+            vertices = np.concatenate([[(p1 + p2) / 2], cap2, cap1, cap2[:1]])
+            self.render_primitive(layer, color, vertices,
+                                  antialias, moderngl.TRIANGLE_FAN)
+            return
 
         # Calculate the four corners of the rectangle
-        vertices = np.array([p1 + perpendicular,
-                             p1 - perpendicular,
-                             p2 + perpendicular,
-                             p2 - perpendicular])
+        vertices = np.array([(p1[0] + px, p1[1] + py),
+                             (p1[0] - px, p1[1] - py),
+                             (p2[0] + px, p2[1] + py),
+                             (p2[0] - px, p2[1] - py)])
 
         # Draw line segment as a rectangle
         self.render_primitive(layer, color, vertices,
                               antialias, moderngl.TRIANGLE_STRIP)
 
-        # Draw caps at both ends of the line segment
-        if capped:
-            angle = np.rad2deg(np.arctan2(direction[1], direction[0]))
-            self.render_circle_arc(
-                layer, color, p1, h_thickness, angle + 90, angle + 270, antialias)
-            self.render_circle_arc(layer, color,
-                                   p2, h_thickness, angle - 90, angle + 90)
-
     def release_opengl_resources(self):
         """
         Manually release OpenGL resources managed by the RenderEngine.
@@ -678,11 +1404,42 @@ class RenderEngine:
         - This method is automatically called by the garbage collector,
           so there is no need to do it manually.
         """
-        self._shader_draw.release()
+        if self._shader_draw is not None:
+            self._shader_draw.release()
+        if self._shader_tonemap is not None:
+            self._shader_tonemap.release()
+        self._shader_instanced.release()
+        self._instance_vao.release()
+        self._instance_vbo.release()
+        self._unit_quad_vbo.release()
+        self._quad_vbo.release()
+        self._batch_vbo.release()
+        self._batch_ibo.release()
+        if self._prim_vao is not None:
+            self._prim_vao.release()
+        if self._prog_prim is not None:
+            self._prog_prim.release()
+        self._prim_vbo.release()
+        for pbo in self._pbo_ring:
+            pbo.release()
         self._screen.framebuffer.release()
         self._ctx.release()
 
         self._shader_draw = None
+        self._shader_tonemap = None
+        self._shader_instanced = None
+        self._instance_vao = None
+        self._instance_vbo = None
+        self._unit_quad_vbo = None
+        self._quad_vbo = None
+        self._batch_vbo = None
+        self._batch_ibo = None
+        self._prim_vao = None
+        self._prog_prim = None
+        self._prim_vbo = None
+        self._bound_tex = None
+        self._bound_fbo = None
+        self._pbo_ring = None
         self._screen = None
         self._ctx = None
 
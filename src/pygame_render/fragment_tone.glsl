@@ -4,10 +4,10 @@ in vec2 fragmentTexCoord;// top-left is [0, 1] and bottom-right is [1, 0]
 uniform sampler2D imageTexture;// texture in location 0
 
 out vec4 FragColor;
-uniform float exposure = 0.1;
+uniform float exposureLog2e = -0.1 * 1.4426950408889634;// -exposure * log2(e), folded on the CPU
 
 vec3 toneMapping(vec3 color) {
-    return vec3(1) - exp(-color*exposure);
+    return vec3(1) - exp2(color*exposureLog2e);
 }
 
 void main() {    
@@ -1,5 +1,5 @@
 from moderngl import Texture, Framebuffer
-from pygame_render.util import normalize_color_arguments
+from pygame_render.util import normalize_color_arguments, INV_255
 
 
 class Layer:
@@ -56,6 +56,11 @@ class Layer:
             B (int): Blue component value (0-255).
             A (int): Alpha component value (0-255).
         """
+        # Fast path for separate components, which need no unpacking
+        if not isinstance(R, tuple):
+            self._fbo.clear(R * INV_255, G * INV_255, B * INV_255, A * INV_255)
+            return
+
         R, G, B, A = normalize_color_arguments(R, G, B, A)
         self._fbo.clear(R, G, B, A)
 
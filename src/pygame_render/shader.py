@@ -1,7 +1,17 @@
-from moderngl import Buffer, Program, Texture
+from functools import partial
+from typing import Any, Callable
+
+from moderngl import Buffer, Program, Texture, VertexArray
 import numpy as np
 
 
+# Texture bound to each texture unit by the sampler2D uniforms of any shader
+_bound_textures: dict[int, Texture] = {}
+
+# Incremented whenever the textures bound to the sampler2D locations change
+_bind_generation: int = 0
+
+
 class Shader:
     """
     A class for managing shader programs and related objects.
@@ -26,8 +36,21 @@ class Shader:
 
         # sampler2D locations
         self._fresh_location: int = 1
+        self._sampler2D_units: dict[str, int] = {}
         self._sampler2D_locations: dict[str, tuple[Texture, int]] = {}
 
+        # Whether the sampler2D textures changed since they were last bound,
+        # and the binding generation they were bound at
+        self._samplers_dirty: bool = False
+        self._samplers_generation: int = -1
+
+        # Setter for each key and whether it takes textures (None for UBOs),
+        # resolved on first assignment
+        self._setters: dict[str, tuple[Callable[[Any], None], bool | None]] = {}
+
+        # Vertex arrays of the quad VBOs used to draw with this shader
+        self._vao_dict: dict[tuple[int, int | None], VertexArray] = {}
+
     @property
     def program(self) -> Program:
         """Get the ModernGL shader program."""
@@ -60,18 +83,61 @@ class Shader:
         - value: The value to be assigned.
 
         Raises:
-        - AssertionError: If the key represents a UBO and the value is not of type 'bytes'.
+        - AssertionError: If the key represents a UBO and the value is not a bytes-like object or a NumPy array.
+
+        Note: The kind of the key is resolved on its first assignment and cached,
+        so subsequent assignments to the same key skip the lookups. Assigning a texture
+        to a key that held another kind of value, or the other way around, resolves it again.
+        """
+        is_texture = isinstance(value, Texture)
+        entry = self._setters.get(key)
+        if entry is None or (entry[1] is not None and entry[1] != is_texture):
+            entry = self._make_setter(key, is_texture)
+            self._setters[key] = entry
+        entry[0](value)
+
+    def _make_setter(self, key, is_texture: bool) -> tuple[Callable[[Any], None], bool | None]:
+        """
+        Create the setter for a uniform variable, UBO, or sampler2D,
+        along with whether it takes textures (None for UBOs).
         """
         if key in self._ubo_dict:  # UBO
-            assert isinstance(
-                value, bytes), 'Make sure to convert your data into bytes before writing it to the uniform buffer.'
-            self._ubo_dict[key].write(value)
-        elif isinstance(value, Texture):  # sampler2D
-            self._program[key].value = self._fresh_location
-            self._sampler2D_locations[key] = (value, self._fresh_location)
-            self._fresh_location += 1
+            return partial(self._write_ubo, self._ubo_dict[key]), None
+        elif is_texture:  # sampler2D
+            return partial(self._set_sampler2D, key), True
         else:  # uniform variable
-            self._program[key] = value
+            # A sampler2D that is now set directly no longer binds its texture
+            if self._sampler2D_locations.pop(key, None) is not None:
+                self._samplers_dirty = True
+            self._sampler2D_units.pop(key, None)
+            return partial(setattr, self._program[key], 'value'), False
+
+    def _write_ubo(self, ubo: Buffer, value):
+        """
+        Write data into a uniform buffer.
+
+        Note: NumPy arrays are written directly through the buffer protocol,
+        so there is no need to convert them with tobytes first.
+        """
+        assert isinstance(
+            value, (bytes, bytearray, memoryview, np.ndarray)), 'Make sure to convert your data into bytes or a NumPy array before writing it to the uniform buffer.'
+        ubo.write(value)
+
+    def _set_sampler2D(self, key, value: Texture):
+        """
+        Assign a texture to a sampler2D uniform.
+
+        Note: Each sampler2D keeps the location it is given on its first assignment,
+        so the uniform only has to be written once.
+        """
+        location = self._sampler2D_units.get(key)
+        if location is None:
+            location = self._fresh_location
+            self._fresh_location += 1
+            self._program[key].value = location
+            self._sampler2D_units[key] = location
+        self._sampler2D_locations[key] = (value, location)
+        self._samplers_dirty = True
 
     def sample_ubo_binding(self) -> int:
         """
@@ -83,6 +149,14 @@ class Shader:
         self._fresh_ubo_binding += 1
         return binding
 
+    def get_ubo(self, name: str) -> Buffer | None:
+        """
+        Get the UBO with a specified name, or None if it has not been added.
+
+        Note: This method is used in RenderEngine.reserve_uniform_block.
+        """
+        return self._ubo_dict.get(name)
+
     def add_ubo(self, ubo: Buffer, name: str):
         """
         Add a UBO with a specified name to the Shader.
@@ -90,24 +164,70 @@ class Shader:
         Note: This method is used in RenderEngine.reserve_uniform_block.
         """
         self._ubo_dict[name] = ubo
+        self._setters.pop(name, None)
 
     def bind_sampler2D_uniforms(self):
         """
         Bind the sampler2d uniforms to their assigned locations.
 
+        Nothing is done if the textures have not changed since the last bind
+        and no other shader has bound textures in between.
+        Textures that are already bound to their location are skipped.
+
         Note: This method is used in RenderEngine.render.
         """
+        global _bind_generation
+        if not self._samplers_dirty and self._samplers_generation == _bind_generation:
+            return
         for tex, location in self._sampler2D_locations.values():
-            tex.use(location)
+            if _bound_textures.get(location) is not tex:
+                tex.use(location)
+                _bound_textures[location] = tex
+                _bind_generation += 1
+        self._samplers_dirty = False
+        self._samplers_generation = _bind_generation
 
     def clear_sampler2D_uniforms(self):
         """
         Clear the sampler2D uniform dictionary.
 
-        Note: This method is used in RenderEngine.render.
+        The locations of the sampler2D uniforms are kept for the next assignments.
+
+        Note: The textures assigned to the sampler2D uniforms are kept between renders,
+        so this is only needed to stop binding them, e.g. before reconfiguring the shader.
         """
         self._sampler2D_locations.clear()
-        self._fresh_location = 1
+        self._samplers_dirty = True
+
+    def quad_vertex_array(self, vbo: Buffer, index_buffer: Buffer | None = None) -> VertexArray:
+        """
+        Get the vertex array that feeds a '2f 2f' (vertexPos, vertexTexCoord) VBO to the shader,
+        optionally through an index buffer of 4-byte indices.
+
+        The vertex array is created on first use and kept until the shader is released.
+
+        Note: This method is used in RenderEngine.render_from_vertices and RenderEngine.render_batch_from_vertices.
+        """
+        key = (vbo.glo, None if index_buffer is None else index_buffer.glo)
+        vao = self._vao_dict.get(key)
+        if vao is None:
+            vao = self._program.ctx.vertex_array(self._program, [
+                (vbo, '2f 2f', 'vertexPos', 'vertexTexCoord'),
+            ], index_buffer=index_buffer, index_element_size=4)
+            self._vao_dict[key] = vao
+        return vao
+
+    @staticmethod
+    def forget_bound_textures():
+        """
+        Forget which textures are bound to the sampler2D locations.
+
+        Call this after binding textures with moderngl directly (e.g. Texture.use(location)),
+        so that the next render binds the sampler2D textures again.
+        """
+        global _bind_generation
+        _bound_textures.clear()
+        _bind_generation += 1
 
     def release(self):
         """
@@ -115,4 +235,6 @@ class Shader:
         """
         for ubo in self._ubo_dict.values():
             ubo.release()
+        for vao in self._vao_dict.values():
+            vao.release()
         self._program.release()
@@ -1,5 +1,11 @@
 from math import radians, cos, sin
 
+import numpy as np
+
+
+# Multiplier that maps color components from 0-255 to 0-1
+INV_255 = 1. / 255.
+
 
 # Convert from 0-255 to 0-1, and also process the different ways
 # in which arguments may be given (an int tuple vs four separate ints)
@@ -13,7 +19,7 @@ def normalize_color_arguments(R: (int | tuple[int]), G: int, B: int, A: int):
             raise ValueError(
                 'Error: The tuple must contain either RGB or RGBA values.')
 
-    return (R/255., G/255., B/255., A/255.)
+    return (R * INV_255, G * INV_255, B * INV_255, A * INV_255)
 
 
 # Convert from 0-1 to 0-255
@@ -21,6 +27,12 @@ def denormalize_color(col):
     return (int(x * 255) for x in col)
 
 
+# Order of the corners of a rectangle for each combination of
+# (flip x axis, flip y axis), indexed by the two flags
+_FLIP_PERMUTATIONS = (((0, 1, 2, 3), (3, 2, 1, 0)),
+                      ((1, 0, 3, 2), (2, 3, 0, 1)))
+
+
 def create_rotated_rect(position, width, height, scale, angle, flip):
     # Scale rect
     w = scale[0] * width
@@ -42,28 +54,69 @@ def create_rotated_rect(position, width, height, scale, angle, flip):
     p3 = (-half_w_cos + half_h_sin, -half_w_sin - half_h_cos)
     p4 = (half_w_cos + half_h_sin, half_w_sin - half_h_cos)
 
-    # Flip horizontally
-    if flip[0]:
-        p3, p4 = p4, p3
-        p1, p2 = p2, p1
-
-    # Flip vertically
-    if flip[1]:
-        p2, p3 = p3, p2
-        p1, p4 = p4, p1
+    # Flip by reordering the corners
+    ps = (p1, p2, p3, p4)
+    perm = _FLIP_PERMUTATIONS[bool(flip[0])][bool(flip[1])]
 
     # Translate vertices
     x, y = position
     x += half_w
     y += half_h
-    ps = [(px + x, py + y) for (px, py) in [p1, p2, p3, p4]]
+    ps = [(ps[i][0] + x, ps[i][1] + y) for i in perm]
 
     return ps
 
 
+# Corners of a centered unit rectangle, in the same order as create_rotated_rect
+_UNIT_RECT_CORNERS = np.array([(.5, .5), (-.5, .5), (-.5, -.5), (.5, -.5)],
+                              dtype=np.float32)
+
+
+def create_rotated_rects(centers: np.ndarray, sizes: np.ndarray, angles: np.ndarray) -> np.ndarray:
+    # Vectorized create_rotated_rect for N rectangles given their centers (N, 2),
+    # sizes (N, 2), where a negative size flips that axis, and angles in radians (N,).
+    # Returns the corners as an array of shape (N, 4, 2)
+    offsets = _UNIT_RECT_CORNERS * sizes[:, None, :]
+    ox, oy = offsets[..., 0], offsets[..., 1]
+
+    cos_a = np.cos(angles)[:, None]
+    sin_a = np.sin(angles)[:, None]
+
+    corners = np.empty(offsets.shape, dtype=np.float32)
+    corners[..., 0] = cos_a * ox - sin_a * oy + centers[:, None, 0]
+    corners[..., 1] = sin_a * ox + cos_a * oy + centers[:, None, 1]
+    return corners
+
+
+# Order in which the corners (p1, p2, p3, p4) of the destination rectangle
+# and of the texture section form the two triangles of a quad
+QUAD_DEST_INDICES = np.array([2, 3, 1, 1, 3, 0])
+QUAD_SECTION_INDICES = np.array([2, 3, 0, 0, 3, 1])
+
+# The same two triangles as four shared vertices, given by the corner of the destination
+# rectangle and of the texture section of each vertex, and the indices of the triangles
+QUAD_VERTEX_DEST_INDICES = np.array([2, 3, 1, 0])
+QUAD_VERTEX_SECTION_INDICES = np.array([2, 3, 0, 1])
+QUAD_TRIANGLE_INDICES = np.array([0, 1, 2, 2, 1, 3], dtype=np.uint32)
+
+
 def to_dest_coords(p: tuple[float, float], dest_width: float, dest_height: float):
     return (2. * p[0] / dest_width - 1., 1. - 2. * p[1] / dest_height)
 
 
 def to_source_coords(p: tuple[float, float], source_width: float, source_height: float):
     return (p[0] / source_width, p[1] / source_height)
+
+
+def to_dest_coords_array(points, dest_width: float, dest_height: float) -> np.ndarray:
+    # Vectorized to_dest_coords for points given as an array-like of shape (..., 2)
+    coords = np.array(points, dtype=np.float64) * 2.
+    coords[..., 0] /= dest_width
+    coords[..., 0] -= 1.
+    coords[..., 1] = 1. - coords[..., 1] / dest_height
+    return coords
+
+
+def to_source_coords_array(points, source_width: float, source_height: float) -> np.ndarray:
+    # Vectorized to_source_coords for points given as an array-like of shape (..., 2)
+    return np.array(points, dtype=np.float64) / (source_width, source_height)
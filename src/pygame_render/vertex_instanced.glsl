@@ -0,0 +1,24 @@
+#version 330 core
+
+layout(location=0)in vec2 vertexCorner;// top-left is [0, 0] and bottom-right is [1, 1]
+in vec2 instanceCenter;// center of the rectangle in layer pixels
+in vec2 instanceSize;// scaled size in pixels, negative to flip an axis
+in float instanceAngle;// rotation in radians
+in vec4 instanceSection;// origin and size of the section in texture coordinates
+
+uniform vec2 layerSize;
+
+out vec2 fragmentTexCoord;
+
+void main()
+{
+    // Scale, flip, and rotate the corner around the center of the rectangle
+    vec2 offset=(vertexCorner-.5)*instanceSize;
+    float c=cos(instanceAngle);
+    float s=sin(instanceAngle);
+    vec2 pos=instanceCenter+vec2(c*offset.x-s*offset.y,s*offset.x+c*offset.y);
+
+    // Convert from layer pixels to destination coordinates
+    gl_Position=vec4(2.*pos.x/layerSize.x-1.,1.-2.*pos.y/layerSize.y,0.,1.);
+    fragmentTexCoord=instanceSection.xy+vec2(vertexCorner.x,1.-vertexCorner.y)*instanceSection.zw;
+}